@@ -1,7 +1,8 @@
 import pygame as pg
 from buttons import Button, LevelButton, Label
 from letters import LogoLetter
-from grids import GridPart
+from grids import GridPart, GridIndex
+from boards import HexGrid
 
 class Area:
     """Representation of an area of the screen."""
@@ -12,12 +13,14 @@ class Area:
         # Set up the basics
         self.screen = mixmi.screen
         self.sett = mixmi.sett
+        self.renderer = mixmi.renderer
         self.visible = visible
 
     def setter(self, attribute, value):
-        """Set the value of an attribute."""
+        """Set the value of an attribute, and redraw the whole screen."""
         
         setattr(self, attribute, value)
+        self.renderer.mark_all()
 
 class Bar(Area):
     """Representation of a title bar."""
@@ -48,15 +51,6 @@ class Bar(Area):
         self.resize.update()
         self.close.update()
 
-    def adjust(self):
-        """Adjust the title bar's position after resizing."""
-
-        self.pos = self.sett.adjust(self.pos)
-        self.image = self.sett.image("bar")
-        self.minimize.adjust()
-        self.resize.adjust()
-        self.close.adjust()
-
     def active(self, pos):
         """Return True if the mouse is on the title bar."""
     
@@ -109,19 +103,6 @@ class Start(Area):
         self.rules.update()
         self.options.update()
 
-    def adjust(self):
-        """Adjust the start screen area's position after resizing."""
-
-        self.pos = self.sett.adjust(self.pos)
-        self.m_0.adjust()
-        self.i_0.adjust()
-        self.x_0.adjust()
-        self.m_1.adjust()
-        self.i_1.adjust()
-        self.play.adjust()
-        self.rules.adjust()
-        self.options.adjust()
-
 class Control(Area):
     """Representation of the control screen area."""
 
@@ -151,9 +132,9 @@ class Control(Area):
         # Set up the buttons and labels
         self.back = Button(mixmi, self.back_pos, "back")
         self.reset = Button(mixmi, self.reset_pos, "reset")
-        self.diffs = self._get_labels('diff')
-        self.level = self._get_labels('level')
-        self.lucks = self._get_labels('luck')
+        self.diffs = self._get_labels(mixmi, 'diff')
+        self.level = self._get_labels(mixmi, 'level')
+        self.lucks = self._get_labels(mixmi, 'luck')
 
     def update(self, game):
         """Update the control screen area on the screen."""
@@ -165,21 +146,11 @@ class Control(Area):
             for diff in self.diffs: diff.update()
             for luck in self.lucks: luck.update()
 
-    def adjust(self):
-        """Adjust the control screen area's position after resizing."""
-
-        self.pos = self.sett.adjust(self.pos)
-        self.back.adjust()
-        self.level.adjust()
-        self.reset.adjust()
-        for diff in self.diffs: diff.adjust()
-        for luck in self.lucks: luck.adjust()
-
-    def _get_labels(self, l_type):
+    def _get_labels(self, mixmi, l_type):
         """Return the labels representing the specified type."""
 
         if l_type == 'level':
-            return Label(self.screen, self.sett, self.level_pos, l_type)
+            return Label(mixmi, self.level_pos, l_type)
             
         labels = []
         label_attr = 'level_diff' if l_type == 'diff' else 'level_luck'
@@ -189,9 +160,9 @@ class Control(Area):
 
         for label in range(5):
             if label <= label_value - 1:
-                labels.append(Label(self.screen, self.sett, pos[label], f"{l_type}_on"))
+                labels.append(Label(mixmi, pos[label], f"{l_type}_on"))
             else:
-                labels.append(Label(self.screen, self.sett, pos[label], f"{l_type}_off"))
+                labels.append(Label(mixmi, pos[label], f"{l_type}_off"))
         return labels
 
 class Levels(Area):
@@ -203,22 +174,35 @@ class Levels(Area):
         # Set up the basics
         super().__init__(mixmi, False)
 
-        # Set up the positions
+        # Set up the positions, buttons are placed on a 10 by 10 lattice
         self.pos = (72, 108)
+        self.pitch = 72
+        self.rect = pg.Rect(self.pos, (self.pitch * 10, self.pitch * 10))
 
         # Set up the buttons
         self.buttons = self._create_buttons(mixmi)
+        self.pressed = None
 
     def update(self):
         """Update the level screen area on the screen."""
 
         for button in self.buttons: button.update()
 
-    def adjust(self):
-        """Adjust the level screen area's position after resizing."""
+    def active(self, pos):
+        """Return True if the mouse is on a level button."""
+
+        return self.button_at(pos) is not None
 
-        self.pos = self.sett.adjust(self.pos)
-        for button in self.buttons: button.adjust()
+    def button_at(self, pos):
+        """Return the level button under the position, or None."""
+
+        # The lattice place is computed directly, then only its button tested
+        column = (pos[0] - self.pos[0]) // self.pitch
+        row = (pos[1] - self.pos[1]) // self.pitch
+        if 0 <= column < 10 and 0 <= row < 10:
+            button = self.buttons[row * 10 + column]
+            if button.active(pos):
+                return button
 
     def _create_buttons(self, mixmi):
         """Return the list of buttons representing the levels."""
@@ -227,7 +211,8 @@ class Levels(Area):
         level_id = 1
         for row in range(10):
             for column in range(10):
-                pos = (self.pos[0] + column * 72, self.pos[1] + row * 72)
+                pos = (self.pos[0] + column * self.pitch,
+                       self.pos[1] + row * self.pitch)
                 buttons.append(LevelButton(mixmi, pos, level_id))
                 level_id += 1
         
@@ -250,6 +235,8 @@ class Game(Area):
 
         # Set up the grid
         self.grid = self._create_grid()
+        self.hexes = HexGrid(*self._get_grid_shape())
+        self.index = GridIndex(self.grid, self.hexes)
         self.grid_visible = False
 
         # Set up the buttons' positions
@@ -273,27 +260,6 @@ class Game(Area):
         if self.grid_visible:
             self.grid.update()
 
-    def adjust(self):
-        """Adjust the game area's position after resizing."""
-
-        # Adjust the game area
-        self.pos = self.sett.adjust(self.pos)
-        self.image = self.sett.image("game_area")
-        self.rect = pg.Rect(self.pos, self.image.get_size())
-
-        # Send info to the settings after adjusting
-        self.sett.setter("game_pos", self.pos)
-        self.sett.setter("game_size", self.image.get_size())
-
-        # Adjust the buttons
-        self.left.adjust()
-        self.switch.adjust()
-        self.right.adjust()
-
-        # Adjust the grid
-        for grid_part in self.grid:
-            grid_part.adjust()
-
     def active(self, pos):
         """Return True if the mouse is on the game screen area."""
     
@@ -313,14 +279,14 @@ class Game(Area):
         """Toggle the grid's visibility."""
 
         self.grid_visible = not self.grid_visible
+        self.renderer.mark_all()
 
     def _create_grid(self):
         """Return the Group of grid parts covering the game area."""
 
         grid = pg.sprite.Group()
         size = self.sett.bubble_size[0]
-        row_parts = self.image.get_width() // size
-        column_parts = self.image.get_height() // size * 6 // 5
+        row_parts, column_parts = self._get_grid_shape()
         x = self.pos[0]
         y = self.pos[1]
 
@@ -335,6 +301,14 @@ class Game(Area):
 
         return grid 
 
+    def _get_grid_shape(self):
+        """Return the number of parts in a longer row, and number of rows."""
+
+        size = self.sett.bubble_size[0]
+        row_parts = self.image.get_width() // size
+        column_parts = self.image.get_height() // size * 6 // 5
+        return row_parts, column_parts
+
 class Lost(Area):
     """Representation of the game over screen area."""
 
@@ -357,13 +331,6 @@ class Lost(Area):
         self.screen.blit(self.image, self.pos)
         self.try_again.update()
 
-    def adjust(self):
-        """Adjust the game over screen area's position after resizing."""
-
-        self.pos = self.sett.adjust(self.pos)
-        self.image = self.sett.image("game_over_area")
-        self.try_again.adjust()
-
 class Won(Area):
     """Representation of the winning screen area."""
 
@@ -384,11 +351,4 @@ class Won(Area):
         """Update the winning screen area on the screen."""
 
         self.screen.blit(self.image, self.pos)
-        self.next_level.update()
-
-    def adjust(self):
-        """Adjust the winning screen area's position after resizing."""
-
-        self.pos = self.sett.adjust(self.pos)
-        self.image = self.sett.image("game_won_area")
-        self.next_level.adjust()
\ No newline at end of file
+        self.next_level.update()
\ No newline at end of file
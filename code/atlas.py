@@ -0,0 +1,78 @@
+import pygame, json, math, os, sys
+
+def pack_images(sizes):
+    """Return the atlas size and positions of images packed on shelves."""
+
+    """Images are sorted from the tallest to the shortest and placed left to
+    right on horizontal shelves. A new shelf is opened under the previous
+    one whenever the next image does not fit in the width of the atlas. The
+    width is the smallest power of two that fits the widest image and makes
+    the atlas roughly square."""
+
+    area = sum(w * h for w, h in sizes.values())
+    widest = max(w for w, h in sizes.values())
+    width = 2 ** math.ceil(math.log2(max(widest, math.sqrt(area))))
+
+    positions = {}
+    x, y, shelf = 0, 0, 0
+    for name in sorted(sizes, key=lambda n: (-sizes[n][1], -sizes[n][0], n)):
+        w, h = sizes[name]
+        if x + w > width:
+            x, y, shelf = 0, y + shelf, 0
+        positions[name] = (x, y, w, h)
+        x += w
+        shelf = max(shelf, h)
+
+    return (width, y + shelf), positions
+
+def build_atlas(scale, images_dir="../images"):
+    """Pack every image of a scale into one atlas with a JSON index."""
+
+    # Load the separate images
+    source = os.path.join(images_dir, scale)
+    images = {}
+    for file_name in sorted(os.listdir(source)):
+        if file_name.endswith(".png"):
+            images[file_name[:-4]] = pygame.image.load(
+                os.path.join(source, file_name))
+
+    # Copy the images onto the atlas, the atlas starts fully transparent
+    size, positions = pack_images(
+        {name: image.get_size() for name, image in images.items()})
+    atlas = pygame.Surface(size, pygame.SRCALPHA, 32)
+    for name, image in images.items():
+        atlas.blit(image, positions[name][:2],
+                   special_flags=pygame.BLEND_RGBA_ADD)
+
+    # Save the atlas and the sub-rects of the images
+    target = os.path.join(images_dir, "atlas")
+    os.makedirs(target, exist_ok=True)
+    pygame.image.save(atlas, os.path.join(target, f"{scale}.png"))
+    with open(os.path.join(target, f"{scale}.json"), "w") as index:
+        json.dump({"size": size, "images": positions}, index, indent=1)
+
+    return size, len(images)
+
+def load_atlas(scale, images_dir="../images"):
+    """Return the atlas of a scale and its index, building it first if the
+    images are newer."""
+
+    source = os.path.join(images_dir, scale)
+    path = os.path.join(images_dir, "atlas", scale)
+    newest = max([os.path.getmtime(source)] +
+                 [os.path.getmtime(os.path.join(source, file_name))
+                  for file_name in os.listdir(source)])
+    if not all(os.path.exists(f"{path}{ext}") and
+               os.path.getmtime(f"{path}{ext}") >= newest
+               for ext in (".png", ".json")):
+        build_atlas(scale, images_dir)
+
+    with open(f"{path}.json") as index:
+        rects = json.load(index)["images"]
+    return pygame.image.load(f"{path}.png"), rects
+
+if __name__ == '__main__':
+    # Pack the scales given, the screen is only drawn with the 2x images
+    for scale in sys.argv[1:] or ("2x",):
+        size, count = build_atlas(scale)
+        print(f"Packed {count} images into a {size[0]}x{size[1]} {scale} atlas.")
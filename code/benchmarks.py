@@ -0,0 +1,159 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import json, math, platform, random, statistics, sys, time, tracemalloc
+from boards import HexGrid
+from rules import Rules
+from mixmi import Mixmi
+
+def time_case(setup, call, budget=0.5, least=5, rounds=5):
+    """Return the ops/sec of a call, and what it allocates."""
+
+    """The setup runs before every call, outside of the timing, so calls
+    changing the board always start from the same one. The budget is split
+    into rounds, and in every round calls repeat until its share is spent,
+    and at least the specified number of times. The ops/sec is the median of
+    the rounds, so a round slowed down by the machine doesn't count.
+    Allocations are traced on one more call, as tracing slows calls down:
+    the peak KB it allocates, and the number of blocks it leaves allocated."""
+
+    rates = []
+    for _ in range(rounds):
+        calls, spent = 0, 0.0
+        while spent < budget / rounds or calls < least:
+            setup()
+            start = time.perf_counter()
+            call()
+            spent += time.perf_counter() - start
+            calls += 1
+        rates.append(calls / spent)
+
+    setup()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    call()
+    after = tracemalloc.take_snapshot()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "lineno")
+                 if stat.count_diff > 0)
+    return {"ops_per_sec": statistics.median(rates), "alloc_kb": peak / 1024,
+            "alloc_blocks": blocks}
+
+def fill(mixmi, size):
+    """Fill the game board with a controlled number of bubbles."""
+
+    mixmi._create_level(2)
+    for bubble in mixmi.bubbles.sprites():
+        bubble.kill()
+    mixmi.rules.start(mixmi.sett.level_colors,
+                      mixmi.sett.level_diff, mixmi.sett.level_luck)
+    mixmi.rules.seed(size)
+    rng = random.Random(size)
+    colors = mixmi.sett.level_colors
+    for id_ in sorted(rng.sample(range(len(mixmi.game.hexes)), size)):
+        mixmi._create_bubble(id_, name_color=rng.choice(colors))
+
+def fill_rules(rules, size):
+    """Fill a headless board with a controlled number of bubbles."""
+
+    rules.start(rules.all_colors[:3])
+    rules.seed(size)
+    rng = random.Random(size)
+    for id_ in rng.sample(range(rules.board.size), size):
+        rules.place(id_, rng.choice(rules.colors))
+
+def find_edge(mixmi):
+    """Return an occupied grid part and an empty one next to it."""
+
+    for id_ in range(len(mixmi.game.hexes)):
+        if mixmi._is_occupied(id_):
+            for id_around in mixmi._get_ids_around(id_):
+                if not mixmi._is_occupied(id_around):
+                    return id_, id_around
+
+def run(sizes=(50, 200, 800)):
+    """Return the results of every benchmark case, by case name."""
+
+    mixmi = Mixmi()
+    mixmi.recorder = None
+    mixmi.game.visible = True
+    cells = len(mixmi.game.hexes)
+    results = {}
+
+    results["create_level"] = time_case(
+        lambda: None, lambda: mixmi._create_level(1))
+
+    for size in sizes:
+        # The game board holds a few hundred bubbles, leave it room to grow
+        if size > cells // 2:
+            continue
+        results[f"multiply_bubbles_{size}"] = time_case(
+            lambda: fill(mixmi, size), mixmi._multiply_bubbles)
+
+        fill(mixmi, size)
+        hit, empty = find_edge(mixmi)
+        results[f"find_cluster_{size}"] = time_case(
+            lambda: None, lambda: mixmi.rules.board.cluster(hit))
+        results[f"find_lonely_bubbles_{size}"] = time_case(
+            lambda: None, mixmi.rules.lonely)
+
+        def aim():
+            mixmi.player.hit = hit
+            mixmi.player.rect.center = mixmi.game.index.center(empty)
+        results[f"find_snapping_point_{size}"] = time_case(
+            aim, mixmi._find_snapping_point)
+
+        angles = [math.radians(20 + 140 * i / 199) for i in range(200)]
+        results[f"predict_shots_{size}"] = time_case(
+            lambda: None, lambda: mixmi._predict_shots(angles))
+
+        results[f"update_screen_{size}"] = time_case(
+            mixmi.renderer.mark_all, mixmi._update_screen)
+
+    # Bigger boards than the game's are run headless, on the rules alone
+    rules = Rules(HexGrid(40, 48), mixmi.sett.level_original_colors)
+    for size in sizes:
+        results[f"rules_multiply_{size}"] = time_case(
+            lambda: fill_rules(rules, size), rules.multiply)
+    return results
+
+def compare(results, baseline, tolerance=0.2):
+    """Return the cases running slower than the baseline by the tolerance."""
+
+    return {name: result["ops_per_sec"] / baseline[name]["ops_per_sec"]
+            for name, result in results.items() if name in baseline and
+            result["ops_per_sec"] < baseline[name]["ops_per_sec"] * (
+                1 - tolerance)}
+
+if __name__ == '__main__':
+    # Save the results, and with --baseline make them the new baseline.
+    # Timings only compare on the same machine, so every machine keeps its
+    # own baseline, and none is committed
+    target = "../benchmarks"
+    results = run()
+    os.makedirs(target, exist_ok=True)
+    with open(os.path.join(target, "results.json"), "w") as file:
+        json.dump(results, file, indent=1)
+
+    baseline = {}
+    baseline_path = os.path.join(
+        target, f"baseline-{platform.node() or 'local'}.json")
+    if "--baseline" in sys.argv[1:]:
+        with open(baseline_path, "w") as file:
+            json.dump(results, file, indent=1)
+    elif os.path.exists(baseline_path):
+        with open(baseline_path) as file:
+            baseline = json.load(file)
+
+    slower = compare(results, baseline)
+    for name, result in results.items():
+        change = ""
+        if name in baseline:
+            ratio = result["ops_per_sec"] / baseline[name]["ops_per_sec"]
+            change = f"  {ratio:6.2f}x baseline"
+            if name in slower:
+                change += "  SLOWER"
+        print(f"{name:28} {result['ops_per_sec']:12.1f} ops/s "
+              f"{result['alloc_kb']:10.1f} KB/call "
+              f"{result['alloc_blocks']:8} blocks/call{change}")
+    sys.exit(1 if slower else 0)
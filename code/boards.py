@@ -0,0 +1,339 @@
+from array import array
+import random
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class HexGrid:
+    """Representation of the hexagonal grid's cells and their neighbors."""
+
+    def __init__(self, columns, rows):
+        """Initialize the grid, precomputing the neighbors of every cell."""
+
+        """Rows alternate between longer ones, with the specified number of
+        columns, and shorter ones, with one cell less and shifted by half of
+        a cell. The grid starts with a longer row, and any number of rows or
+        columns is supported. Neighbors are stored CSR style: the neighbors of
+        a cell are neighbors[offsets[id]:offsets[id + 1]], in ascending order."""
+
+        self.columns = columns
+        self.rows = rows
+        self._table = None
+
+        # Find the ID of the first cell in every row
+        self.starts = []
+        size = 0
+        for row in range(rows):
+            self.starts.append(size)
+            size += self.row_length(row)
+        self.size = size
+
+        # Precompute the flat table of neighbors
+        self.offsets = array("i", [0])
+        self.neighbors = array("i")
+        for row in range(rows):
+            for column in range(self.row_length(row)):
+                self.neighbors.extend(self._find_around(row, column))
+                self.offsets.append(len(self.neighbors))
+
+    def __len__(self):
+        """Return the number of cells in the grid."""
+
+        return self.size
+
+    def table(self):
+        """Return the neighbors as a NumPy matrix, padded with -1 to 6."""
+
+        if self._table is None:
+            self._table = np.full((self.size, 6), -1, dtype=np.intp)
+            for id_grid in range(self.size):
+                ids = self.around(id_grid)
+                self._table[id_grid, :len(ids)] = ids
+        return self._table
+
+    def row_length(self, row):
+        """Return the number of cells in the specified row."""
+
+        return self.columns if row % 2 == 0 else self.columns - 1
+
+    def around(self, id_grid):
+        """Return the IDs of the cells around the specified cell."""
+
+        if id_grid is None or not 0 <= id_grid < self.size:
+            return array("i")
+        return self.neighbors[self.offsets[id_grid]:self.offsets[id_grid + 1]]
+
+    def _find_around(self, row, column):
+        """Return the IDs of the cells around a cell, in ascending order."""
+
+        # Longer rows touch the cells to the left and right of them in the
+        # shorter rows, and shorter rows touch the cells below and after
+        shift = -1 if row % 2 == 0 else 0
+        sides = (column + shift, column + shift + 1)
+        ids = []
+        for next_row, columns in ((row - 1, sides),
+                                  (row, (column - 1, column + 1)),
+                                  (row + 1, sides)):
+            if 0 <= next_row < self.rows:
+                for next_column in columns:
+                    if 0 <= next_column < self.row_length(next_row):
+                        ids.append(self.starts[next_row] + next_column)
+        return ids
+
+class Board:
+    """Representation of the bubbles on the grid, free of any drawing."""
+
+    def __init__(self, grid, colors, components=False):
+        """Initialize an empty board on the specified hexagonal grid."""
+
+        # Every cell holds a color code, 0 for an empty one
+        self.grid = grid
+        self.size = len(grid)
+        self.colors = list(colors)
+        self.cells = bytearray(self.size)
+        self.count = 0
+
+        # Searches stamp the cells they visit, so nothing has to be cleared
+        self.visited = array("I", bytes(4 * self.size))
+        self.stamp = 0
+
+        # Optionally track the same colored clusters as they change
+        self.components = Components(self) if components else None
+
+    def __len__(self):
+        """Return the number of bubbles on the board."""
+
+        return self.count
+
+    def around(self, id_grid):
+        """Return the IDs of the cells around the specified cell."""
+
+        return self.grid.around(id_grid)
+
+    def code(self, color):
+        """Return the code of a color, as stored in the cells."""
+
+        return self.colors.index(color) + 1
+
+    def color(self, id_grid):
+        """Return the color of the bubble in a cell, or None if it's empty."""
+
+        if self.is_occupied(id_grid):
+            return self.colors[self.cells[id_grid] - 1]
+
+    def is_occupied(self, id_grid):
+        """Return True if the cell with the specified ID holds a bubble."""
+
+        return id_grid is not None and 0 <= id_grid < self.size and (
+            self.cells[id_grid] != 0)
+
+    def put(self, id_grid, color):
+        """Put a bubble of the specified color in a cell."""
+
+        if self.cells[id_grid]:
+            self.clear(id_grid)
+        self.count += 1
+        self.cells[id_grid] = self.code(color)
+        if self.components:
+            self.components.add(id_grid)
+
+    def clear(self, id_grid):
+        """Remove the bubble from a cell."""
+
+        if self.cells[id_grid]:
+            self.count -= 1
+            if self.components:
+                self.components.remove(id_grid)
+        self.cells[id_grid] = 0
+
+    def load(self, cells):
+        """Replace every cell of the board at once, with the color codes."""
+
+        self.cells[:] = cells
+        self.count = self.size - self.cells.count(0)
+        if self.components:
+            self.components.reload()
+
+    def cluster(self, id_grid):
+        """Return the IDs of connected bubbles of the same color as a cell."""
+
+        """The search is an iterative breadth-first search over the cells, so
+        long chains can't hit the recursion limit. The list of found IDs is
+        the search queue too."""
+
+        if not self.is_occupied(id_grid):
+            return []
+
+        # Start a new search, resetting the stamps before they overflow
+        if self.stamp == 0xFFFFFFFF:
+            self.visited = array("I", bytes(4 * self.size))
+            self.stamp = 0
+        self.stamp += 1
+
+        cells, visited, stamp = self.cells, self.visited, self.stamp
+        offsets, neighbors = self.grid.offsets, self.grid.neighbors
+        code = cells[id_grid]
+        visited[id_grid] = stamp
+        cluster = [id_grid]
+        for id_ in cluster:
+            for id_around in neighbors[offsets[id_]:offsets[id_ + 1]]:
+                if visited[id_around] != stamp and cells[id_around] == code:
+                    visited[id_around] = stamp
+                    cluster.append(id_around)
+        return cluster
+
+    def cluster_size(self, id_grid):
+        """Return the number of bubbles in the cluster of a cell."""
+
+        if not self.is_occupied(id_grid):
+            return 0
+        if self.components:
+            return self.components.size(id_grid)
+        return len(self.cluster(id_grid))
+
+    def multiply(self, drop, chance, codes, rng=random):
+        """Return the cells and color codes of bubbles born by multiplying."""
+
+        """Bubbles multiply one after another, in the order of their cells,
+        into the empty cells around them no bubble before them took. When a
+        bubble has more than drop such cells, drop of them are left out at
+        random. A new bubble gets the color of its parent with the specified
+        chance, and a random code out of codes otherwise. Only the empty
+        cells around every bubble are found at once, as arrays when NumPy is
+        there. The cells are claimed and the colors drawn bubble by bubble,
+        from the one random stream, so a seed gives the same bubbles with or
+        without NumPy and replays go the same on either. The new bubbles are
+        returned together, for the game to add in one go."""
+
+        if not codes:
+            return [], []
+        if np is not None:
+            candidates = self._candidates_arrays()
+        else:
+            candidates = self._candidates_cells()
+
+        # Give the cells to the first bubble choosing them
+        cells = self.cells
+        born = {}
+        for parent, empty in candidates:
+            empty = [id_ for id_ in empty if id_ not in born]
+            if len(empty) > drop:
+                empty = rng.sample(empty, len(empty) - drop)
+            for id_ in empty:
+                born[id_] = cells[parent]
+
+        ids = list(born)
+        new_codes = [born[id_] if rng.random() < chance else
+                     codes[rng.randrange(len(codes))] for id_ in ids]
+        return ids, new_codes
+
+    def _candidates_arrays(self):
+        """Return every bubble and the empty cells around it, with NumPy."""
+
+        cells = np.frombuffer(self.cells, dtype=np.uint8)
+        parents = np.flatnonzero(cells)
+        around = self.grid.table()[parents]
+        around = np.where((around >= 0) & (cells[around] == 0), around, -1)
+        return zip(parents.tolist(), [[id_ for id_ in ids if id_ >= 0]
+                                      for ids in around.tolist()])
+
+    def _candidates_cells(self):
+        """Return every bubble and the empty cells around it, cell by cell."""
+
+        cells = self.cells
+        return [(parent, [id_ for id_ in self.around(parent) if not cells[id_]])
+                for parent in range(self.size) if cells[parent]]
+
+class Components:
+    """Representation of the same colored clusters of a board, as union-find."""
+
+    def __init__(self, board):
+        """Initialize the components of an empty board."""
+
+        """Placing a bubble joins its cell with the same colored cells around
+        it. Removing bubbles can split a cluster, which a union-find can't
+        undo, but the game only ever removes whole clusters or lonely bubbles.
+        So removal only counts the cluster down, and the sets are rebuilt from
+        the board only when a cluster was left with some of its bubbles."""
+
+        self.board = board
+        self.parents = array("i", range(board.size))
+        self.sizes = array("i", bytes(4 * board.size))
+        self.touched = set()
+
+    def add(self, id_grid):
+        """Add a placed bubble, joining it with the clusters around it."""
+
+        # A rebuild reads the board, so it has added the bubble already
+        if self._refresh():
+            return
+
+        self.parents[id_grid] = id_grid
+        self.sizes[id_grid] = 1
+        cells = self.board.cells
+        for id_around in self.board.around(id_grid):
+            if cells[id_around] == cells[id_grid]:
+                self._union(id_grid, id_around)
+
+    def remove(self, id_grid):
+        """Count a removed bubble out of its cluster."""
+
+        root = self._find(id_grid)
+        self.sizes[root] -= 1
+        self.touched.add(root)
+
+    def size(self, id_grid):
+        """Return the number of bubbles in the cluster of an occupied cell."""
+
+        self._refresh()
+        return self.sizes[self._find(id_grid)]
+
+    def reload(self):
+        """Rebuild every cluster, after the whole board was replaced."""
+
+        self.touched = set()
+        self._rebuild()
+
+    def _refresh(self):
+        """Rebuild the clusters if a removal may have split one of them."""
+
+        touched, self.touched = self.touched, set()
+        if any(self.sizes[root] > 0 for root in touched):
+            self._rebuild()
+            return True
+        return False
+
+    def _rebuild(self):
+        """Rebuild every cluster from the cells of the board."""
+
+        cells = self.board.cells
+        for id_grid in range(self.board.size):
+            self.parents[id_grid] = id_grid
+            self.sizes[id_grid] = 1 if cells[id_grid] else 0
+        for id_grid in range(self.board.size):
+            if not cells[id_grid]:
+                continue
+            for id_around in self.board.around(id_grid):
+                if id_around > id_grid and cells[id_around] == cells[id_grid]:
+                    self._union(id_grid, id_around)
+
+    def _find(self, id_grid):
+        """Return the root of the cluster of a cell, halving the path to it."""
+
+        parents = self.parents
+        while parents[id_grid] != id_grid:
+            parents[id_grid] = parents[parents[id_grid]]
+            id_grid = parents[id_grid]
+        return id_grid
+
+    def _union(self, id_a, id_b):
+        """Join the clusters of two cells, the smaller one under the bigger."""
+
+        root_a, root_b = self._find(id_a), self._find(id_b)
+        if root_a == root_b:
+            return
+        if self.sizes[root_a] < self.sizes[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parents[root_b] = root_a
+        self.sizes[root_a] += self.sizes[root_b]
@@ -1,4 +1,5 @@
 import pygame as pg
+from shots import sweep
 
 class Bubble(pg.sprite.Sprite):
     """Representation of a bubble."""
@@ -10,6 +11,7 @@ class Bubble(pg.sprite.Sprite):
         super().__init__()
         self.screen = mixmi.screen
         self.sett = mixmi.sett
+        self.renderer = mixmi.renderer
         self.pos = pos
         self.rect = pg.Rect(self.pos, self.sett.bubble_size)
 
@@ -27,24 +29,25 @@ class Bubble(pg.sprite.Sprite):
 
         # Blow up the bubble
         self.image = self._get_image()
+        self.renderer.mark(self.rect)
 
     def update(self):
         """Update the bubble."""
         
         self.screen.blit(self.image, self.pos)
 
+    def kill(self):
+        """Remove the bubble from the screen and from all of its groups."""
+
+        self.renderer.mark(self.rect)
+        super().kill()
+
     def recolor(self, color):
         """Recolor the bubble."""
         
         self.color = color
         self.image = self._get_image()
-
-    def adjust(self):
-        """Adjust the bubble's position after resizing."""
-        
-        self.pos = self.sett.adjust(self.pos)
-        self.rect = pg.Rect(self.pos, self.sett.bubble_size)
-        self.image = self._get_image()
+        self.renderer.mark(self.rect)
 
     def _get_image(self):
         """Return the bubble's image."""
@@ -70,17 +73,56 @@ class Player(Bubble):
         self.moving_right = False
         self.shooting = False
 
+        # Set up the ID of the grid part the shot hit
+        self.hit = None
+
+        # Set up the positions to draw the bubble between ticks
+        self.previous_pos = self.pos
+        self.drawn_pos = self.pos
+
     def update(self):
-        """Update the player's bubble, acting on movement flags."""
+        """Update the player's bubble on the screen."""
+
+        self.screen.blit(self.image, self.drawn_pos)
+
+    def kill(self):
+        """Remove the player's bubble from where it was drawn."""
+
+        self.renderer.mark(self._get_drawn_rect())
+        super().kill()
+
+    def recolor(self, color):
+        """Recolor the player's bubble where it was drawn."""
+
+        self.renderer.mark(self._get_drawn_rect())
+        super().recolor(color)
+
+    def step(self, obstacles=()):
+        """Move the player's bubble one tick, acting on movement flags."""
+
+        self.previous_pos = self.pos
 
         # Update on sliding
         if self.moving_left or self.moving_right: self._slide()
 
         # Update on shooting
-        elif self.shooting: self._shoot()
+        elif self.shooting: self._shoot(obstacles)
 
-        # Update the image
-        self.screen.blit(self.image, self.pos)
+    def interpolate(self, alpha):
+        """Draw the bubble between its previous and current positions."""
+
+        x = self.previous_pos[0] + (self.pos[0] - self.previous_pos[0]) * alpha
+        y = self.previous_pos[1] + (self.pos[1] - self.previous_pos[1]) * alpha
+        if (x, y) != self.drawn_pos:
+            self.renderer.mark(self._get_drawn_rect())
+            self.drawn_pos = (x, y)
+            self.renderer.mark(self._get_drawn_rect())
+
+    def _get_drawn_rect(self):
+        """Return the area the bubble was drawn at, with a pixel of margin."""
+
+        # Rounding of the position may shift the image by a pixel
+        return pg.Rect(self.drawn_pos, self.sett.bubble_size).inflate(2, 2)
 
     def move(self, action):
         """Handle the movement of the player's bubble, acting on the action."""
@@ -102,18 +144,16 @@ class Player(Bubble):
             self.moving_right = False
             self.shooting = False
 
+            # Nothing moves after stopping, so the next frame may run no ticks
+            # and draw the bubble where it was before the last tick
+            self.previous_pos = self.pos
+
     def aim(self, target_pos):
         """Set the target position for the player's bubble."""
         
         self.target_pos = target_pos
         self.shooting = True
 
-    def recolor(self, color):
-        """Recolor the player's bubble."""
-        
-        self.color = color
-        self.image = self._get_image()
-
     def _slide(self):
         """Update the player's bubble as it slides left or right."""
 
@@ -128,19 +168,34 @@ class Player(Bubble):
 
         self.rect = pg.Rect(self.pos, self.sett.bubble_size)
 
-    def _shoot(self):
+    def _shoot(self, obstacles):
         """Update the player's bubble position after player takes a shot."""
     
         """Shooting makes the bubble travel in a straight line to the target,
         and continue moving in that direction, until it hits a wall. On hitting
-        a wall, the bubble will bounce off and change its direction."""
+        a wall, the bubble will bounce off and change its direction. The whole
+        travel of a frame is swept at once, so the bubble stops exactly where
+        it first touches a bubble, however fast it moves."""
 
+        radius = self.sett.bubble_size[0] / 2
+        center = (self.pos[0] + radius, self.pos[1] + radius)
         direction = self._get_direction_vector(self.pos, self.target_pos)
-        self._update_position_with_direction(direction)
-        new_direction = self._handle_wall_collision(direction)
-        self._update_target_position_with_direction(new_direction)
+        center, direction, self.hit = sweep(
+            center, direction, self.sett.bubble_speed,
+            self.sett.bubble_size[0], self.get_walls(), obstacles)
+        self.pos = (center[0] - radius, center[1] - radius)
+        self._update_target_position_with_direction(direction)
         self._update_rect()
 
+    def get_walls(self):
+        """Return the left, top and right walls as bounds of the center."""
+
+        radius = self.sett.bubble_size[0] / 2
+        left = self.sett.game_pos[0] + radius
+        top = self.sett.game_pos[1] + radius
+        right = self.sett.game_pos[0] + self.sett.game_size[0] - radius
+        return left, top, right
+
     def _get_direction_vector(self, starting_position, target_position):
         """Return the normalized direction vector from two positions."""
 
@@ -157,39 +212,6 @@ class Player(Bubble):
 
         return direction
 
-    def _update_position_with_direction(self, direction_vector):
-        """Update the player's bubble position based on direction vector."""
-
-        x_pos, y_pos = self.pos
-        x_pos += direction_vector[0] * self.sett.bubble_speed
-        y_pos += direction_vector[1] * self.sett.bubble_speed
-        self.pos = (x_pos, y_pos)
-
-    def _handle_wall_collision(self, direction_vector):
-        """Return the new direction of the bubble after hitting a wall."""
-
-        # Get the direction vector components
-        x = direction_vector[0]
-        y = direction_vector[1]
-
-        # Get game's area edges
-        left = self.sett.game_pos[0]
-        top = self.sett.game_pos[1]
-        right = self.sett.game_pos[0] + self.sett.game_size[0] - (
-                                         self.sett.bubble_size[0])
-
-        # On horizontal collision, change the x of the direction vector
-        if self.pos[0] < left or self.pos[0] > right:
-            x = -x
-            self.pos = (self.pos[0] + x * self.sett.bubble_speed, self.pos[1])
-
-        # On vertical collision, change the y of the direction vector
-        if self.pos[1] < top:
-            y = -y
-            self.pos = (self.pos[0], self.pos[1] + y * self.sett.bubble_speed)
-
-        return (x, y)
-
     def _update_target_position_with_direction(self, vector):
         """Update the target position to reflect the new direction."""
 
@@ -201,4 +223,39 @@ class Player(Bubble):
         """Update the player bubble's area based on its position."""
 
         self.rect.x = round(self.pos[0])
-        self.rect.y = round(self.pos[1])
\ No newline at end of file
+        self.rect.y = round(self.pos[1])
+
+class Bubbles(pg.sprite.Group):
+    """Representation of a group of bubbles, indexed by their grid IDs."""
+
+    def __init__(self, size):
+        """Initialize an empty group, for a grid of the specified size."""
+
+        super().__init__()
+        self.cells = [None] * size
+
+    def add_internal(self, sprite, layer=None):
+        """Add a bubble to the group, at its grid part."""
+
+        super().add_internal(sprite, layer)
+        if self._on_grid(sprite.id_grid):
+            self.cells[sprite.id_grid] = sprite
+
+    def remove_internal(self, sprite):
+        """Remove a bubble from the group, and from its grid part."""
+
+        super().remove_internal(sprite)
+        if self._on_grid(sprite.id_grid) and (
+                self.cells[sprite.id_grid] is sprite):
+            self.cells[sprite.id_grid] = None
+
+    def at(self, id_grid):
+        """Return the bubble at the specified grid part, or None."""
+
+        if self._on_grid(id_grid):
+            return self.cells[id_grid]
+
+    def _on_grid(self, id_grid):
+        """Return True if the grid ID is a part of the grid."""
+
+        return id_grid is not None and 0 <= id_grid < len(self.cells)
@@ -1,32 +1,52 @@
-class Button:
-    """Representation of a button."""
+class Widget:
+    """Representation of an image shown on the screen, e.g. a button."""
 
-    def __init__(self, mixmi, position, name):
-        """Initialize the game's buttons."""
+    def __init__(self, mixmi, position):
+        """Initialize the widget's basics, its image is loaded by subclasses."""
 
         self.screen = mixmi.screen
         self.sett = mixmi.sett
+        self.renderer = mixmi.renderer
         self.pos = position
-        self.status = False
-        self.name = name
-        self.image = self.load_image()
 
     def update(self):
-        """Update the button on the screen."""
+        """Update the widget on the screen."""
 
         self.screen.blit(self.image, self.pos)
 
-    def adjust(self):
-        """Adjust the button's position after resizing."""
+    def show(self, image):
+        """Show a new image, marking the widget as changed on the screen."""
+
+        if image is not self.image:
+            self.renderer.mark((self.pos, self.image.get_size()))
+            self.renderer.mark((self.pos, image.get_size()))
+            self.image = image
+
+    def active(self, pos):
+        """Return True if the mouse is on the widget."""
 
-        self.pos = self.sett.adjust(self.pos)
+        x_0, y_0 = self.pos
+        x_1, y_1 = self.image.get_size()
+
+        return x_0 <= pos[0] <= x_0 + x_1 and y_0 <= pos[1] <= y_0 + y_1
+
+class Button(Widget):
+    """Representation of a button."""
+
+    def __init__(self, mixmi, position, name):
+        """Initialize the game's buttons."""
+
+        super().__init__(mixmi, position)
+        self.status = False
+        self.name = name
         self.image = self.load_image()
 
     def reload_image(self, name):
         """Reload the image after changing the button name."""
 
-        self.name = name
-        self.image = self.load_image()
+        if name != self.name:
+            self.name = name
+            self.show(self.load_image())
 
     def load_image(self):
         """Load an image, acting on current click status."""
@@ -37,102 +57,51 @@ class Button:
             return self.sett.image(f"button_{self.name}")
 
     def click(self, status):
-        """Change the click status of the button."""
-
-        self.status = status
-        self.image = self.load_image()
+        """Change the click status of the button, if it changed."""
 
-    def active(self, pos):
-        """Return True if the mouse is on the button."""
-    
-        x_0, y_0 = self.pos
-        x_1, y_1 = self.image.get_size()
-
-        return x_0 <= pos[0] <= x_0 + x_1 and y_0 <= pos[1] <= y_0 + y_1
+        if status != self.status:
+            self.status = status
+            self.show(self.load_image())
 
-class LevelButton():
+class LevelButton(Button):
     """Representation of a level button."""
 
     def __init__(self, mixmi, position, level):
         """Initialize the game's level buttons."""
-        
-        self.screen = mixmi.screen
-        self.sett = mixmi.sett
-        self.pos = position
+
         self.level = level
-        self.status = False
         self.locked = True
-        self.image = self.load_image()
-
-    def update(self):
-        """Update the level button on the screen."""
-
-        self.screen.blit(self.image, self.pos)
-
-    def adjust(self):
-        """Adjust the level button's position after resizing."""
-
-        self.pos = self.sett.adjust(self.pos)
-        self.image = self.load_image()
+        super().__init__(mixmi, position, f"level_{level}")
 
     def unlock(self):
         """Unlock the button."""
 
-        self.locked = False
-        self.image = self.load_image()
-
-    def click(self, status):
-        """Change the click status of the button."""
-
-        self.status = status
-        self.image = self.load_image()
-
-    def active(self, pos):
-        """Return True if the mouse is on the button."""
-    
-        x_0, y_0 = self.pos
-        x_1, y_1 = self.image.get_size()
-
-        return x_0 <= pos[0] <= x_0 + x_1 and y_0 <= pos[1] <= y_0 + y_1
+        if self.locked:
+            self.locked = False
+            self.show(self.load_image())
 
     def load_image(self):
         """Load an image, acting on current click and locked statuses."""
-            
+
         if self.locked:
             return self.sett.image(f"button_level_{self.level}_locked")
-        elif self.status:
-            return self.sett.image(f"button_level_{self.level}_clicked")
-        else:
-            return self.sett.image(f"button_level_{self.level}")
+        return super().load_image()
 
-class Label():
+class Label(Widget):
     """Representation of a label."""
 
-    def __init__(self, screen, sett, position, l_type):
+    def __init__(self, mixmi, position, l_type):
         """Initialize the labels' attributes."""
 
-        self.screen = screen
-        self.sett = sett
-        self.pos = position
+        super().__init__(mixmi, position)
         self.type = l_type
         self.image = self.load_image()
 
-    def update(self):
-        """Update the label on the screen."""
-
-        self.screen.blit(self.image, self.pos)
-
-    def adjust(self):
-        """Adjust the label's position after resizing."""
-
-        self.pos = self.sett.adjust(self.pos)
-        self.image = self.load_image()
-
     def reload_image(self, l_type):
         """Reload the image after changing the label type."""
 
         self.type = l_type
-        self.image = self.load_image()
+        self.show(self.load_image())
 
     def load_image(self):
         """Return an image, acting on label type and value."""
@@ -147,4 +116,3 @@ class Label():
             return self.sett.image("label_diff")
         elif self.type == "diff_off":
             return self.sett.image("label_diff_off")
-            
\ No newline at end of file
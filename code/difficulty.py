@@ -0,0 +1,149 @@
+import argparse, json, multiprocessing, os, random, time
+from boards import HexGrid
+from rules import COLORS, Rules
+from levels import load_pack
+
+# The player's bubble slides across the last two rows of the grid, so the
+# game is lost once a bubble reaches any part of them
+LANE_ROWS = 2
+
+LEVEL_SOURCE = "../levels/levels.json"
+LEVEL_PACK = "../levels/levels.pack"
+
+def frontier(rules):
+    """Return the empty cells next to a bubble, where a shot can snap."""
+
+    board = rules.board
+    return [id_ for id_ in range(board.size) if not board.is_occupied(id_)
+            and any(board.is_occupied(id_around)
+                    for id_around in board.around(id_))]
+
+def random_policy(rules, colors, rng):
+    """Return a random cell to shoot at, keeping the player's color."""
+
+    return rng.choice(frontier(rules)), False
+
+def greedy_policy(rules, colors, rng):
+    """Return the cell and color joining the biggest cluster of the color."""
+
+    """Both the player's color and the saved one are tried, so the policy
+    switches the bubbles whenever the saved one does better. Ties are broken
+    at random."""
+
+    best, choices = -1, []
+    for id_ in frontier(rules):
+        for switch, color in enumerate(colors):
+            size = rules.joined(id_, color)
+            if size > best:
+                best, choices = size, []
+            if size == best:
+                choices.append((id_, bool(switch)))
+    return rng.choice(choices)
+
+POLICIES = {"random": random_policy, "greedy": greedy_policy}
+
+_grid, _pack = None, None
+
+def play(level, seed, policy="random", max_shots=200):
+    """Play a game of a level headless, and return how it went."""
+
+    """A game is seeded the same way as in Mixmi, so a seed gives the same
+    colors and multiplying. The policy picks where the player's bubble snaps,
+    and whether to switch it with the saved one first. A game that isn't over
+    after max_shots counts as lost."""
+
+    global _grid, _pack
+    if _grid is None:
+        # The levels are laid out on the grid their source names
+        with open(LEVEL_SOURCE) as file:
+            _grid = HexGrid(*json.load(file)["grid"])
+        _pack = load_pack(LEVEL_SOURCE, LEVEL_PACK)
+    start = time.perf_counter()
+
+    # Set up the level, as Mixmi._create_level does
+    data = _pack.level(level)
+    colors = COLORS.copy()
+    random.Random(f"{seed}:colors").shuffle(colors)
+    lane = range(_grid.starts[_grid.rows - LANE_ROWS], len(_grid))
+    rules = Rules(_grid, COLORS)
+    rules.start(colors[:data.max_colors], data.diff, data.luck, lane)
+    rules.seed(seed)
+    rules.load(data.cells)
+
+    # Shoot until the board is cleared, or reaches the player
+    rng = random.Random(f"{seed}:shots")
+    player = [rng.choice(rules.colors), rng.choice(rules.colors)]
+    shots, peak = 0, len(rules.board)
+    while not rules.won() and not rules.lost() and shots < max_shots:
+        cell, switch = POLICIES[policy](rules, player, rng)
+        if switch:
+            player.reverse()
+        rules.place(cell, player[0])
+        rules.resolve(cell)
+        shots += 1
+        peak = max(peak, len(rules.board))
+
+        # The saved bubble comes next, and colors gone from the board too
+        if rules.colors:
+            player = [player[1], rng.choice(rules.colors)]
+            if player[0] not in rules.colors:
+                player[0] = rng.choice(rules.colors)
+
+    return {"level": level, "won": rules.won(), "shots": shots, "peak": peak,
+            "time": time.perf_counter() - start}
+
+def _play(task):
+    """Play a game of a task, unpacking it for the process pool."""
+
+    return play(*task)
+
+def estimate(levels, games, seed, policy="random", max_shots=200,
+             processes=None):
+    """Return the results of every level, playing games on every core."""
+
+    """Each game gets its own seed, drawn from the seed, its level and its
+    number, so the results are the same whatever order the games run in."""
+
+    tasks = [(level, random.Random(f"{seed}:{level}:{game}").getrandbits(32),
+              policy, max_shots) for level in levels for game in range(games)]
+    results = {level: [] for level in levels}
+    with multiprocessing.Pool(processes or os.cpu_count()) as pool:
+        for result in pool.imap_unordered(_play, tasks, chunksize=8):
+            results[result["level"]].append(result)
+    return results
+
+def summarize(games):
+    """Return the win rate, shots to clear, peak bubbles and ms per game."""
+
+    won = [game for game in games if game["won"]]
+    shots = sum(game["shots"] for game in won) / len(won) if won else None
+    return (len(won) / len(games), shots,
+            sum(game["peak"] for game in games) / len(games),
+            sum(game["time"] for game in games) * 1000 / len(games))
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="Estimate how hard every level plays, by simulation.")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--policy", choices=POLICIES, default="random")
+    parser.add_argument("--max-shots", type=int, default=200)
+    parser.add_argument("--first", type=int, default=1)
+    parser.add_argument("--last", type=int, default=100)
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args()
+
+    pack = load_pack(LEVEL_SOURCE, LEVEL_PACK)
+    start = time.perf_counter()
+    results = estimate(range(args.first, args.last + 1), args.games,
+                       args.seed, args.policy, args.max_shots, args.processes)
+    print(f"{'level':>5} {'diff':>4} {'luck':>4} {'win rate':>8} "
+          f"{'shots':>7} {'peak':>7} {'ms/game':>8}")
+    for level, games in results.items():
+        rate, shots, peak, ms = summarize(games)
+        shots = f"{shots:7.1f}" if shots is not None else f"{'-':>7}"
+        data = pack.level(level)
+        print(f"{level:5} {data.diff:4} {data.luck:4} "
+              f"{rate:8.1%} {shots} {peak:7.1f} {ms:8.2f}")
+    print(f"Played {sum(map(len, results.values()))} games "
+          f"in {time.perf_counter() - start:.1f} s.")
@@ -23,13 +23,75 @@ class GridPart(pg.sprite.Sprite):
 
         pg.draw.rect(self.screen, (237, 60, 200), self.rect, 1)
 
-    def adjust(self):
-        """Redraw the grid part after resizing the screen."""
-
-        self.pos = self.sett.adjust(self.pos)
-        self.rect = pg.Rect(self.pos, self.sett.bubble_size)
-
     def get_pos_by_id(self, id):
         """Return the position of a grid part by its ID."""
         
-        return self.pos
\ No newline at end of file
+        return self.pos
+
+class GridIndex:
+    """Representation of an index of the grid parts by their IDs."""
+
+    def __init__(self, grid, hexes):
+        """Initialize the index, with the grid parts sorted by their IDs."""
+
+        parts = sorted(grid, key=lambda part: part.id)
+        self.first = parts[0].id if parts else 0
+        self.positions = [part.pos for part in parts]
+        self.rects = [part.rect.copy() for part in parts]
+        self.centers = [part.rect.center for part in parts]
+
+        # Set up the shape of the grid, to find grid parts by position
+        self.hexes = hexes
+        self.size = self.rects[0].width if parts else 1
+        self.row_height = self.size * 5 // 6
+        self.origin = self.positions[0] if parts else (0, 0)
+
+    def __len__(self):
+        """Return the number of indexed grid parts."""
+
+        return len(self.positions)
+
+    def __contains__(self, id_grid):
+        """Return True if the grid part with the specified ID is indexed."""
+
+        return id_grid is not None and 0 <= id_grid - self.first < len(self)
+
+    def pos(self, id_grid):
+        """Return the position of a grid part by its ID."""
+
+        return self.positions[id_grid - self.first]
+
+    def rect(self, id_grid):
+        """Return the rect of a grid part by its ID."""
+
+        return self.rects[id_grid - self.first]
+
+    def center(self, id_grid):
+        """Return the center of a grid part by its ID."""
+
+        return self.centers[id_grid - self.first]
+
+    def near(self, rect):
+        """Return the IDs of grid parts overlapping the specified rect."""
+
+        """Rows and columns of the hexagonal grid are computed from the rect's
+        edges, so only the handful of grid parts under the rect are visited,
+        however big the grid is."""
+
+        x, y, width, height = rect
+        size, row_height = self.size, self.row_height
+        x_0, y_0 = self.origin
+
+        ids = []
+        if width <= 0 or height <= 0:
+            return ids
+        first_row = max((y - y_0 - size) // row_height + 1, 0)
+        last_row = min((y + height - 1 - y_0) // row_height, self.hexes.rows - 1)
+        for row in range(first_row, last_row + 1):
+            shift = x_0 + (size // 2 if row % 2 else 0)
+            first = max((x - shift - size) // size + 1, 0)
+            last = min((x + width - 1 - shift) // size,
+                       self.hexes.row_length(row) - 1)
+            start = self.hexes.starts[row] + self.first
+            ids.extend(range(start + first, start + last + 1))
+        return ids
@@ -15,12 +15,6 @@ class LogoLetter:
 
         self.screen.blit(self.image, self.pos)
 
-    def adjust(self):
-        """Adjust the logo letter's position after resizing."""
-
-        self.pos = self.sett.adjust(self.pos)
-        self.image = self._load_image()
-
     def _load_image(self):
         """Load an image, acting on current click status."""
 
@@ -0,0 +1,117 @@
+import hashlib, json, mmap, os, struct, sys
+from boards import HexGrid
+from rules import level_diff, level_luck, level_max_colors
+
+# A pack starts with its magic, version, number of levels and grid size,
+# then a table of level, difficulty, luck and number of colors per level
+HEADER = struct.Struct("<4sHHH")
+ENTRY = struct.Struct("<HBBB")
+MAGIC = b"MXLV"
+VERSION = 1
+
+class Level:
+    """Representation of a level, as it's stored in the level pack."""
+
+    def __init__(self, number, diff, luck, max_colors, cells):
+        """Initialize the level's settings and its cells."""
+
+        """Cells hold a byte for every cell of the grid: 0 for an empty cell,
+        and the index of the bubble's color among the level colors plus 1
+        for a bubble."""
+
+        self.number = number
+        self.diff = diff
+        self.luck = luck
+        self.max_colors = max_colors
+        self.cells = cells
+
+    def digest(self):
+        """Return a hash of the level's settings and cells, as its identity."""
+
+        """The pack's version only tells its format, so a level edited in
+        the source keeps it. The digest changes with any edit of the level."""
+
+        return hashlib.sha1(bytes([self.diff, self.luck, self.max_colors]) +
+                            bytes(self.cells)).hexdigest()
+
+class LevelPack:
+    """Representation of a compiled level pack, read from a memory map."""
+
+    def __init__(self, path):
+        """Open the pack, reading only its header and table of levels."""
+
+        with open(path, "rb") as file:
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.version, count, self.size = HEADER.unpack_from(self.data)
+        if magic != MAGIC or self.version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} level pack")
+
+        self.entries = {}
+        start = HEADER.size + ENTRY.size * count
+        for index in range(count):
+            entry = ENTRY.unpack_from(
+                self.data, HEADER.size + ENTRY.size * index)
+            self.entries[entry[0]] = entry[1:] + (start + self.size * index,)
+        self.cache = {}
+
+    def __len__(self):
+        """Return the number of levels in the pack."""
+
+        return len(self.entries)
+
+    def level(self, number):
+        """Return a level, decoding it from the pack on first use only."""
+
+        level = self.cache.get(number)
+        if level is None:
+            diff, luck, colors, offset = self.entries[number]
+            level = Level(number, diff, luck, colors,
+                          self.data[offset:offset + self.size])
+            self.cache[number] = level
+        return level
+
+def compile_levels(source, target):
+    """Compile the levels of a JSON file into a binary level pack."""
+
+    """Every level lists its bubbles as [cell ID, color index] pairs. The
+    difficulty, luck and number of colors of a level default to the ones
+    its number gets by the formulas of the rules."""
+
+    with open(source) as file:
+        data = json.load(file)
+    size = len(HexGrid(*data["grid"]))
+
+    table, cells = [], []
+    for level in sorted(data["levels"], key=lambda level: level["level"]):
+        number = level["level"]
+        colors = level.get("colors", level_max_colors(number))
+        table.append(ENTRY.pack(number, level.get("diff", level_diff(number)),
+                                level.get("luck", level_luck(number)), colors))
+        board = bytearray(size)
+        for id_grid, id_color in level["bubbles"]:
+            if not 0 <= id_grid < size or not 0 <= id_color < colors:
+                raise ValueError(
+                    f"level {number} has a bubble out of its grid or colors")
+            board[id_grid] = id_color + 1
+        cells.append(bytes(board))
+
+    with open(target, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(table), size))
+        file.write(b"".join(table))
+        file.write(b"".join(cells))
+    return len(table)
+
+def load_pack(source, target):
+    """Return the level pack, compiling it first if the source is newer."""
+
+    if not os.path.exists(target) or (
+            os.path.getmtime(target) < os.path.getmtime(source)):
+        compile_levels(source, target)
+    return LevelPack(target)
+
+if __name__ == '__main__':
+    # Compile the levels given, or the game's levels by default
+    source = sys.argv[1] if len(sys.argv) > 1 else "../levels/levels.json"
+    target = sys.argv[2] if len(sys.argv) > 2 else "../levels/levels.pack"
+    count = compile_levels(source, target)
+    print(f"Compiled {count} levels into {target}.")
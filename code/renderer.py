@@ -0,0 +1,114 @@
+import pygame as pg
+
+class Renderer:
+    """Representation of a renderer redrawing only the changed screen parts."""
+
+    def __init__(self, mixmi, max_rects=24):
+        """Initialize the renderer's dirty rectangles."""
+
+        self.mixmi = mixmi
+        self.max_rects = max_rects
+        self.rects = []
+        self.full = True
+
+    def mark(self, rect):
+        """Mark a part of the screen as changed."""
+
+        if not self.full:
+            self.rects.append(pg.Rect(rect))
+
+    def mark_all(self):
+        """Mark the whole screen as changed."""
+
+        self.full = True
+        self.rects = []
+
+    def present(self, draw):
+        """Redraw and show the changed parts of the screen, if there are any."""
+
+        """The draw function is called once for every changed part, with the
+        screen clipped to that part, so everything outside of it stays
+        untouched. Each part is then scaled on its own to the window, when the
+        window isn't the screen's size. Returns the number of parts pushed to
+        the display."""
+
+        if not self.full and not self.rects:
+            return 0
+
+        screen = self.mixmi.screen
+        if self.full:
+            rects = [screen.get_rect()]
+        else:
+            rects = self._merge(screen.get_rect())
+
+        shown = []
+        for rect in rects:
+            target = self._to_window(rect)
+            rect = self._to_screen(target).clip(screen.get_rect())
+            screen.set_clip(rect)
+            draw(rect)
+            shown.append(self._show(rect, target))
+        screen.set_clip(None)
+        pg.display.update(shown)
+
+        self.rects = []
+        self.full = False
+        return len(shown)
+
+    def _show(self, rect, target):
+        """Copy a part of the screen to its part of the window."""
+
+        screen, window = self.mixmi.screen, self.mixmi.display
+        if target.size == rect.size:
+            window.blit(screen, target, rect)
+        else:
+            window.blit(pg.transform.smoothscale(
+                screen.subsurface(rect), target.size), target)
+        return target
+
+    def _to_window(self, rect):
+        """Return the window pixels covering a part of the screen."""
+
+        (width, height), (window_width, window_height) = (
+            self.mixmi.sett.screen_size, self.mixmi.sett.window_size)
+        left = rect.left * window_width // width
+        top = rect.top * window_height // height
+        right = -(-rect.right * window_width // width)
+        bottom = -(-rect.bottom * window_height // height)
+        return pg.Rect(left, top, right - left, bottom - top)
+
+    def _to_screen(self, target):
+        """Return the screen pixels a part of the window is scaled from."""
+
+        """Parts are widened to whole window pixels, so the ones scaled
+        separately still meet without seams."""
+
+        (width, height), (window_width, window_height) = (
+            self.mixmi.sett.screen_size, self.mixmi.sett.window_size)
+        left = target.left * width // window_width
+        top = target.top * height // window_height
+        right = -(-target.right * width // window_width)
+        bottom = -(-target.bottom * height // window_height)
+        return pg.Rect(left, top, right - left, bottom - top)
+
+    def _merge(self, bounds):
+        """Return the changed parts, with the overlapping ones joined."""
+
+        merged = []
+        for rect in self.rects:
+            rect = rect.clip(bounds)
+            if not rect.width or not rect.height:
+                continue
+
+            # Join the rect with every part it overlaps, until none is left
+            index = rect.collidelist(merged)
+            while index != -1:
+                rect.union_ip(merged.pop(index))
+                index = rect.collidelist(merged)
+            merged.append(rect)
+
+        # Too many small parts cost more to redraw than their bounding box
+        if len(merged) > self.max_rects:
+            merged = [merged[0].unionall(merged[1:])]
+
+        return merged
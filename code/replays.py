@@ -0,0 +1,291 @@
+import json, math, os, random, sys, time
+from boards import HexGrid
+from rules import Rules
+from levels import VERSION, load_pack
+from shots import sweep
+
+class Recorder:
+    """Representation of a replay log, written line by line as games run."""
+
+    def __init__(self, path):
+        """Initialize the recorder, opening the log only on the first game."""
+
+        """Every line of the log is a JSON record. A game starts with its
+        level and the level's digest, seed, the version of the level pack it
+        was loaded from, the grid shape, every color and the geometry of the
+        game area. The level itself is loaded again from the pack, and the
+        digest tells if it was edited since. Then follow the switches and
+        the shots, with where the player's bubble was shot from and at, and
+        its color. After a shot comes the grid part its bubble snapped to, or
+        a restart when it left the game area. A finished game ends with its
+        result and the final board."""
+
+        self.path = path
+        self.file = None
+
+    def start(self, level, seed, version, grid, rules, geometry):
+        """Record the start of a game, after its level was created."""
+
+        self._write({"level": level.number, "digest": level.digest(),
+                     "seed": seed, "pack": version,
+                     "grid": [grid.columns, grid.rows],
+                     "colors": rules.all_colors, **geometry})
+
+    def aim(self, start, target, color):
+        """Record a shot from the start position at the target, as clicked."""
+
+        self._write({"aim": list(target), "from": list(start),
+                     "color": color})
+
+    def shot(self, cell):
+        """Record the grid part the shot's bubble snapped to."""
+
+        self._write({"snap": cell})
+
+    def switch(self):
+        """Record a switch of the player's bubble with the saved one."""
+
+        self._write({"switch": 1})
+
+    def restart(self):
+        """Record a restart of the player, multiplying the bubbles."""
+
+        self._write({"restart": 1})
+
+    def end(self, result, rules):
+        """Record the end of a game, with its final board."""
+
+        self._write({"end": result, "board": board_state(rules.board)})
+
+    def _write(self, record):
+        """Write a record as a line of the log, right away."""
+
+        if self.file is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self.file = open(self.path, "a")
+        self.file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self.file.flush()
+
+class Replay:
+    """Representation of a game re-run headless, from its starting record."""
+
+    def __init__(self, grid, level, record):
+        """Set up the game as Mixmi._create_level does, from its seed."""
+
+        """The level is the one loaded from the level pack. The colors of
+        the player's bubbles are drawn from the seed's stream, in the same
+        order as the game draws them."""
+
+        self.rng = random.Random(f"{record['seed']}:colors")
+        colors = list(record["colors"])
+        self.rng.shuffle(colors)
+        colors = colors[:level.max_colors]
+
+        self.grid = grid
+        self.rules = Rules(grid, record["colors"])
+        self.rules.start(colors, level.diff, level.luck)
+        self.rules.seed(record["seed"])
+        self.player = self._colorize()
+        self.saved = self._colorize()
+        self.rules.load(level.cells)
+
+        # Set up the geometry of the game area, as in Game and Player
+        self.area = record["area"]
+        self.size, self.speed = record["bubble"]
+        self.start = tuple(record["start"])
+        self.rects = self._grid_rects()
+
+    def shoot(self, start, target):
+        """Return the grid part a shot snaps to, or "miss" if it left."""
+
+        """The shot moves tick by tick as Player._shoot moves it, and snaps
+        as Mixmi._find_snapping_point finds the grid part. The snapped grid
+        part is None when there was no empty one to snap to."""
+
+        radius = self.size / 2
+        x, y, width, height = self.area
+        walls = (x + radius, y + radius, x + width - radius)
+        board = self.rules.board
+        obstacles = [(id_, self._center(id_)) for id_ in range(board.size)
+                     if board.is_occupied(id_)]
+
+        pos = start
+        while x <= pos[0] < x + width and y <= pos[1] < y + height:
+            run, rise = target[0] - pos[0], target[1] - pos[1]
+            distance = (run ** 2 + rise ** 2) ** 0.5
+            direction = (run / distance, rise / distance)
+            center, direction, hit = sweep(
+                (pos[0] + radius, pos[1] + radius), direction, self.speed,
+                self.size, walls, obstacles)
+            pos = (center[0] - radius, center[1] - radius)
+            target = (pos[0] + direction[0] * self.speed,
+                      pos[1] + direction[1] * self.speed)
+            if hit is not None:
+                return self._snap(hit, (round(pos[0]), round(pos[1])))
+        return "miss"
+
+    def resolve(self, cell):
+        """Burst or multiply after a snap, then respawn the player."""
+
+        if cell is not None:
+            self.rules.place(cell, self.player)
+        previous_max = len(self.rules.colors)
+        self.rules.resolve(cell)
+        if previous_max != len(self.rules.colors):
+            self._colorize()
+            self.saved = self._colorize()
+        self.restart()
+
+    def restart(self):
+        """Restart the player with the saved color, drawing the next one."""
+
+        self._colorize()
+        self.player = self.saved
+        self.saved = self._colorize()
+
+    def switch(self):
+        """Switch the player's bubble with the saved one."""
+
+        self.player, self.saved = self.saved, self.player
+
+    def result(self, pos):
+        """Return "won", "lost" with the player at the position, or None."""
+
+        if self.rules.won():
+            return "won"
+        rect = (pos[0], pos[1], self.size, self.size)
+        if self.rules.lost([id_ for id_, part in enumerate(self.rects)
+                            if _overlap(part, rect)]):
+            return "lost"
+
+    def _colorize(self):
+        """Return the next color of the stream, as Settings.colorize does."""
+
+        colors = self.rules.colors
+        if len(colors) > 0:
+            return colors[self.rng.randint(0, len(colors) - 1)]
+
+    def _grid_rects(self):
+        """Return the rects of the grid parts, as Game._create_grid lays out."""
+
+        rects = []
+        for row in range(self.grid.rows):
+            shift = self.size // 2 if row % 2 else 0
+            y = self.area[1] + row * (self.size * 5 // 6)
+            for column in range(self.grid.row_length(row)):
+                rects.append((self.area[0] + column * self.size + shift, y,
+                              self.size, self.size))
+        return rects
+
+    def _center(self, id_grid):
+        """Return the center of a grid part."""
+
+        x, y, width, height = self.rects[id_grid]
+        return x + width // 2, y + height // 2
+
+    def _snap(self, hit, pos):
+        """Return the empty grid part closest to the bubble stopped at pos."""
+
+        board = self.rules.board
+        center = (pos[0] + self.size // 2, pos[1] + self.size // 2)
+        rect = (pos[0], pos[1], self.size, self.size)
+        ids = [id_ for id_ in board.around(hit) if not board.is_occupied(id_)]
+        if not ids:
+            ids = [id_ for id_, part in enumerate(self.rects)
+                   if _overlap(part, rect) and not board.is_occupied(id_)]
+        closest, shortest = None, float("inf")
+        for id_ in ids:
+            distance = math.dist(center, self._center(id_))
+            if distance < shortest:
+                closest, shortest = id_, distance
+        return closest
+
+def _overlap(rect_a, rect_b):
+    """Return True if two rects overlap, as pygame's colliderect does."""
+
+    return (rect_a[0] < rect_b[0] + rect_b[2] and
+            rect_b[0] < rect_a[0] + rect_a[2] and
+            rect_a[1] < rect_b[1] + rect_b[3] and
+            rect_b[1] < rect_a[1] + rect_a[3])
+
+def board_state(board):
+    """Return the bubbles of a board as a list of [cell, color]."""
+
+    return [[id_, board.color(id_)] for id_ in range(board.size)
+            if board.is_occupied(id_)]
+
+def replay(path, source="../levels/levels.json",
+           target="../levels/levels.pack"):
+    """Re-run every game of a log headless, and return their results."""
+
+    """Every level is loaded from the level pack, every shot is shot again
+    from its aim, and its colors drawn again from the seed. The game went
+    the same when every shot was the recorded color and snapped to the
+    recorded grid part, and it ended with the recorded result and board.
+    Each finished game is returned with "same" or "different", or with
+    "changed" when its level, the pack's format or the grid changed since it
+    was recorded, so it can't be checked."""
+
+    with open(path) as log:
+        records = [json.loads(line) for line in log if line.strip()]
+
+    results = []
+    pack = load_pack(source, target)
+    game, grids = None, {}
+    for record in records:
+        if "level" in record:
+            shape = tuple(record["grid"])
+            if shape not in grids:
+                grids[shape] = HexGrid(*shape)
+            level, outcome = record["level"], None
+            changed = (record["pack"] != VERSION or
+                       len(grids[shape]) != pack.size or
+                       level not in pack.entries or
+                       pack.level(level).digest() != record["digest"])
+            same = not changed
+            if same:
+                game = Replay(grids[shape], pack.level(level), record)
+                pos = game.start
+        elif not same:
+            # A game that went differently can't be followed any further
+            if "end" in record:
+                results.append((level, record["end"],
+                                "changed" if changed else "different"))
+        elif "aim" in record:
+            # Shoot again, and apply what happened once it's recorded
+            pos = tuple(record["from"])
+            same = same and record["color"] == game.player
+            outcome = game.shoot(pos, tuple(record["aim"]))
+        elif "snap" in record:
+            same = same and outcome == record["snap"]
+            game.resolve(outcome if outcome != "miss" else record["snap"])
+            pos = game.start
+        elif "restart" in record:
+            same = same and outcome == "miss"
+            game.restart()
+            game.rules.multiply()
+            pos = game.start
+        elif "switch" in record:
+            game.switch()
+        elif "end" in record:
+            same = same and record["end"] in (
+                game.result(pos), game.result(game.start)) and (
+                board_state(game.rules.board) == record["board"])
+            results.append((level, record["end"],
+                            "same" if same else "different"))
+    return results
+
+if __name__ == '__main__':
+    # Replay the logs given, and report any game that went differently
+    failed = False
+    for path in sys.argv[1:]:
+        start = time.perf_counter()
+        results = replay(path)
+        elapsed = time.perf_counter() - start
+        for level, result, status in results:
+            print(f"{path}: level {level} {result}, " + {
+                "same": "same game", "different": "DIFFERENT GAME",
+                "changed": "level changed since, not checked"}[status])
+            failed = failed or status == "different"
+        print(f"{path}: replayed {len(results)} games in {elapsed:.3f} s")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,160 @@
+import random
+from boards import Board
+
+# Every color a bubble can have, a level plays with some of them
+COLORS = ["red", "yellow", "green", "blue", "pink", "cyan", "orange", "clear"]
+
+class Rules:
+    """Representation of the rules of a game, free of any drawing."""
+
+    # At luck 5 new bubbles have 80% chance of being their parent's color,
+    # and at luck 1 they have 10% chance
+    chances = {5: 0.8, 4: 0.6, 3: 0.4, 2: 0.2, 1: 0.1}
+
+    def __init__(self, grid, colors, rng=random):
+        """Initialize the rules on the specified hexagonal grid."""
+
+        """Colors are every color a bubble can ever have, the board stores
+        them as codes. Only the colors of a level are in play, and they lower
+        as colors disappear from the board. Nothing here draws, so the rules
+        run without a window, as fast as the board can go."""
+
+        self.grid = grid
+        self.all_colors = list(colors)
+        self.rng = rng
+        self.start(self.all_colors)
+
+    def start(self, colors, diff=1, luck=5, lane=()):
+        """Start a level on an empty board, with the colors in play."""
+
+        """The lane holds the IDs of the cells the player's bubble slides
+        through. The level is lost when a bubble reaches any of them."""
+
+        self.board = Board(self.grid, self.all_colors, components=True)
+        self.colors = list(colors)
+        self.diff = diff
+        self.luck = luck
+        self.lane = list(lane)
+
+    def seed(self, seed):
+        """Seed the stream the board multiplies with for the game."""
+
+        self.rng = random.Random(f"{seed}:board")
+
+    def place(self, cell, color):
+        """Put a bubble of the specified color in a cell."""
+
+        self.board.put(cell, color)
+
+    def load(self, cells):
+        """Put the bubbles of a level on the board, in one copy."""
+
+        """Cells hold the index of a bubble's color among the colors in play
+        plus 1, or 0 for an empty cell. They are translated to the board's
+        color codes on the way in."""
+
+        codes = [self.board.code(color) for color in self.colors]
+        table = bytes([0] + codes + [0] * (255 - len(codes)))
+        self.board.load(bytes(cells).translate(table))
+
+    def bubbles(self):
+        """Return the bubbles on the board as (cell, color)."""
+
+        board = self.board
+        return [(id_, board.color(id_)) for id_ in range(board.size)
+                if board.cells[id_]]
+
+    def multiply(self):
+        """Multiply every bubble, returning the new ones as (cell, color)."""
+
+        """The bigger difficulty, the less bubbles are created around every
+        bubble. At difficulty 1, four of the empty places around a bubble are
+        left out, at difficulty 5 none are. The bigger luck, the bigger chance
+        that the created bubbles will have the same color as the one they were
+        created around."""
+
+        board = self.board
+        codes = [board.code(color) for color in self.colors]
+        ids, new_codes = board.multiply(
+            5 - self.diff, self.chances[self.luck], codes, self.rng)
+        born = [(id_, self.all_colors[code - 1])
+                for id_, code in zip(ids, new_codes)]
+        for id_, color in born:
+            board.put(id_, color)
+        return born
+
+    def resolve(self, cell):
+        """Burst or multiply after a bubble was placed in the cell."""
+
+        """Bubbles burst then, and only then, when there are at least three
+        bubbles of the same color connected to each other. Otherwise, every
+        bubble on the board multiplies all around. Then, bubbles left alone
+        burst too, and the colors in play lower to the ones on the board.
+        Returns the cells that burst, and the new bubbles as (cell, color)."""
+
+        burst, born = [], []
+        if self.board.cluster_size(cell) >= 3:
+            burst = self.board.cluster(cell)
+            for id_ in burst:
+                self.board.clear(id_)
+        else:
+            born = self.multiply()
+
+        lonely = self.lonely()
+        for id_ in lonely:
+            self.board.clear(id_)
+        self.colors = self.board_colors()
+        return burst + lonely, born
+
+    def joined(self, cell, color):
+        """Return the size of the cluster a bubble placed in a cell joins."""
+
+        """Clusters of the color around the cell are counted once each,
+        with the placed bubble itself."""
+
+        board, joined = self.board, {cell}
+        code = board.code(color)
+        for id_around in board.around(cell):
+            if board.cells[id_around] == code and id_around not in joined:
+                joined.update(board.cluster(id_around))
+        return len(joined)
+
+    def lonely(self):
+        """Return the IDs of bubbles not connected to any other bubble."""
+
+        cells = self.board.cells
+        return [id_ for id_ in range(self.board.size) if cells[id_] and
+                not any(cells[id_around] for id_around in self.board.around(id_))]
+
+    def board_colors(self):
+        """Return the colors of the bubbles on the board, in play order."""
+
+        codes = set(self.board.cells)
+        return [color for color in self.colors
+                if self.board.code(color) in codes]
+
+    def won(self):
+        """Return True if there are no bubbles left on the board."""
+
+        return len(self.board) == 0
+
+    def lost(self, cells=None):
+        """Return True if a bubble reached the lane, or the specified cells."""
+
+        cells = self.lane if cells is None else cells
+        return any(self.board.is_occupied(id_) for id_ in cells)
+
+def level_diff(level):
+    """Return the difficulty of a level, from 1 to 5, rising every 20 levels."""
+
+    return min((level - 1) // 20 + 1, 5)
+
+def level_luck(level):
+    """Return the luck of a level, from 5 down to 1, every 20 levels over."""
+
+    return 5 - ((level - 1) % 20) // 4
+
+def level_max_colors(level):
+    """Return the number of colors of a level, one more every 20 levels."""
+
+    return min(8, 3 + (level - 1) // 20)
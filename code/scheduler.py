@@ -0,0 +1,98 @@
+import pygame as pg
+import time
+
+class Scheduler:
+    """Representation of a frame scheduler, idling when nothing animates."""
+
+    def __init__(self, sett):
+        """Initialize the scheduler's clock and phase timers."""
+
+        self.sett = sett
+        self.clock = pg.time.Clock()
+        self.phases = {"handle": 0.0, "update": 0.0, "present": 0.0}
+        self.frames = 0
+        self.idle_frames = 0
+
+        # Set up the accumulator of time for fixed simulation ticks
+        self.accumulator = 0.0
+        self.last_time = time.perf_counter()
+
+    def events(self, animating):
+        """Return the events of the next frame, waiting for them when idle."""
+
+        """While something animates, frames run at the full frame rate. When
+        nothing does, the scheduler sleeps until an event arrives, or until
+        the idle timeout passes, so static screens cost no CPU time."""
+
+        self.frames += 1
+        if animating:
+            self.clock.tick(self.sett.screen_fps)
+            return coalesce(pg.event.get())
+
+        self.idle_frames += 1
+        event = pg.event.wait(self.sett.screen_idle_timeout)
+        self.clock.tick()
+
+        # Nothing moved while waiting, so no ticks are owed for that time
+        self.accumulator = 0.0
+        self.last_time = time.perf_counter()
+
+        events = [] if event.type == pg.NOEVENT else [event]
+        return coalesce(events + pg.event.get())
+
+    def ticks(self):
+        """Return the number of fixed simulation ticks due since last frame."""
+
+        """Time passed between frames is added to the accumulator, and every
+        full tick of it is taken out again. After a long stall, at most
+        tick_limit ticks run, so the game slows down instead of freezing."""
+
+        now = time.perf_counter()
+        tick = 1 / self.sett.tick_rate
+        elapsed = min(now - self.last_time, tick * self.sett.tick_limit)
+        self.accumulator += elapsed
+        self.last_time = now
+
+        ticks = int(self.accumulator / tick)
+        self.accumulator -= ticks * tick
+        return ticks
+
+    def alpha(self):
+        """Return how far the time is between the last and the next tick."""
+
+        return self.accumulator * self.sett.tick_rate
+
+    def record(self, phase, start):
+        """Add the time passed since start to the phase, and return now."""
+
+        now = time.perf_counter()
+        self.phases[phase] += now - start
+        return now
+
+    def report(self):
+        """Return a summary of the time spent in each phase of a frame."""
+
+        frames = max(self.frames, 1)
+        phases = ", ".join(f"{phase} {total * 1000 / frames:.3f} ms"
+                           for phase, total in self.phases.items())
+        return (f"{self.frames} frames ({self.idle_frames} idle), "
+                f"average per frame: {phases}")
+
+def coalesce(events):
+    """Return the events, with every run of mouse motions folded into one."""
+
+    """A folded motion has the position and buttons of the last motion of
+    the run, and the sum of their relative moves. Any other event ends a
+    run, so button and key events keep their order around the motions."""
+
+    folded = []
+    for event in events:
+        if event.type == pg.MOUSEMOTION and folded and (
+                folded[-1].type == pg.MOUSEMOTION):
+            rel = folded[-1].rel
+            attributes = dict(event.dict, rel=(
+                rel[0] + event.rel[0], rel[1] + event.rel[1]))
+            folded[-1] = pg.event.Event(pg.MOUSEMOTION, attributes)
+        else:
+            folded.append(event)
+    return folded
@@ -1,6 +1,7 @@
-import pygame, platform, ctypes, math
-from random import randint, shuffle
+import pygame, platform, ctypes, math, os, random, time
 from tkinter import Tk
+from atlas import load_atlas
+from rules import COLORS
 if platform.system() == 'Windows':
     from ctypes import wintypes
 
@@ -10,13 +11,22 @@ class Settings:
     def __init__(self):
         """Initialize the game's settings."""
         
-        # Screen setttings
+        # Screen setttings, the game is laid out and drawn at the screen size
+        # with the images of its scale, then scaled once to the window size
         self.screen_size = (864, 900)
+        self.screen_scale = "2x"
+        self.window_size = self.screen_size
         self.screen_fps = 90
+        self.screen_idle_timeout = 500
+
+        # Simulation settings, the game moves in fixed ticks at any frame rate
+        self.tick_rate = 90
+        self.tick_limit = 5
 
         # Bubble settings
         self.bubble_size = (36, 36)
         self.bubble_speed = 24
+        self.bubble_pause = 100
         self.saved_color = "red"
 
         # Game area settings
@@ -24,13 +34,28 @@ class Settings:
         self.game_size = None
 
         # Level settings
-        self.level_colors = [
-            "red", "yellow", "green", "blue", "pink", "cyan", "orange", "clear"]
+        self.level_colors = COLORS.copy()
         self.level_original_colors = self.level_colors.copy()
         self.level_max_colors = 3
         self.level_current = 1
         self.level_diff = 1
         self.level_luck = 5
+        # Levels are compiled from their source into a pack on first run
+        self.level_source = "../levels/levels.json"
+        self.level_pack = "../levels/levels.pack"
+
+        # Random settings, every game seeds its own stream of colors
+        self.rng = random.Random()
+
+        # Replay settings, games are recorded when MIXMI_REPLAY is set to
+        # anything but 0, and logged to a new file every session
+        self.replay_record = os.environ.get("MIXMI_REPLAY", "0") != "0"
+        self.replay_path = time.strftime("../replays/%Y%m%d-%H%M%S.jsonl")
+
+        # Image cache settings, the atlas is loaded on the first image
+        self.image_cache = {}
+        self.image_atlas = None
+        self.image_stats = {"hits": 0, "misses": 0, "bytes": 0}
 
     def setter(self, attribute, value):
         """Set the value of an attribute."""
@@ -38,34 +63,82 @@ class Settings:
         setattr(self, attribute, value)
 
     def image(self, file_name):
-        """Load an image, acting on current screen size."""
+        """Return a cached image, of the screen's scale."""
 
-        if self.screen_size == (864, 900):
-            return pygame.image.load(
-                f"../images/2x/{file_name}.png").convert_alpha()
-        else:
-            return pygame.image.load(
-                f"../images/1x/{file_name}.png").convert_alpha()
+        image = self.image_cache.get(file_name)
+        if image is not None:
+            self.image_stats["hits"] += 1
+            return image
 
-    def adjust(self, pos):
-        """Adjust the position after resizing the screen."""
+        # Load the image only once
+        self.image_stats["misses"] += 1
+        image = self._load_image(file_name)
+        if image.get_parent() is None:
+            self.image_stats["bytes"] += self._image_bytes(image)
+        self.image_cache[file_name] = image
+        return image
 
-        if self.screen_size == (864, 900):
-            return pos[0] * 2, pos[1] * 2
-        else:
-            return pos[0] // 2, pos[1] // 2
+    def scale(self):
+        """Return the name of the image set the screen is drawn with."""
 
-    def resize(self):
-        """Resize the screen."""
+        return self.screen_scale
 
-        if self.screen_size == (864, 900):
-            self.screen_size = self.screen_size[0]//2, self.screen_size[1]//2
-            self.bubble_size = self.bubble_size[0]//2, self.bubble_size[1]//2
-            self.bubble_speed = self.bubble_speed//2
-        else:
-            self.screen_size = self.screen_size[0]*2, self.screen_size[1]*2
-            self.bubble_size = self.bubble_size[0]*2, self.bubble_size[1]*2
-            self.bubble_speed = self.bubble_speed*2
+    def _load_image(self, file_name):
+        """Return an image cut out of the atlas, or loaded from its file."""
+
+        image = self._atlas_image(file_name)
+        if image is None:
+            image = pygame.image.load(
+                f"../images/{self.scale()}/{file_name}.png").convert_alpha()
+        return image
+
+    def _atlas_image(self, file_name):
+        """Return a view of the image in the atlas, if it's packed."""
+
+        if self.image_atlas is None:
+            self.image_atlas = self._load_atlas(self.scale())
+
+        atlas = self.image_atlas
+        if file_name in atlas[1]:
+            return atlas[0].subsurface(atlas[1][file_name])
+
+    def _load_atlas(self, scale):
+        """Return the atlas of the scale and its index, built on first use."""
+
+        atlas, rects = load_atlas(scale)
+        atlas = atlas.convert_alpha()
+        self.image_stats["bytes"] += self._image_bytes(atlas)
+        return atlas, rects
+
+    def _image_bytes(self, image):
+        """Return the number of bytes held by an image's pixels."""
+
+        return image.get_width() * image.get_height() * image.get_bytesize()
+
+    def resize(self, size=None):
+        """Resize the window, switching between full and half size."""
+
+        """Only the window changes, the screen keeps its size, so nothing
+        has to be laid out or loaded again. Any size can be specified."""
+
+        if size is None:
+            if self.window_size == self.screen_size:
+                size = self.screen_size[0] // 2, self.screen_size[1] // 2
+            else:
+                size = self.screen_size
+        self.window_size = tuple(size)
+
+    def to_screen(self, pos):
+        """Return the screen position of a position in the window."""
+
+        return (pos[0] * self.screen_size[0] // self.window_size[0],
+                pos[1] * self.screen_size[1] // self.window_size[1])
+
+    def to_window(self, pos):
+        """Return the window position of a position on the screen."""
+
+        return (pos[0] * self.window_size[0] // self.screen_size[0],
+                pos[1] * self.window_size[1] // self.screen_size[1])
 
     def colorize(self, id_color=None):
         """Return a color from the list of level colors."""
@@ -74,13 +147,19 @@ class Settings:
             if id_color is not None:
                 return self.level_colors[id_color]
             else:
-                return self.level_colors[randint(0, len(self.level_colors) - 1)]
+                return self.level_colors[
+                    self.rng.randint(0, len(self.level_colors) - 1)]
+
+    def seed(self, seed):
+        """Seed the stream of colors for the next game."""
+
+        self.rng = random.Random(f"{seed}:colors")
 
     def prepare_level(self):
         """Prepare the level for the next game."""
 
         self.level_colors = self.level_original_colors.copy()
-        shuffle(self.level_colors)
+        self.rng.shuffle(self.level_colors)
         self.level_colors = self.level_colors[:self.level_max_colors]
 
 class Cursor:
@@ -91,21 +170,68 @@ class Cursor:
 
         self.sett = mixmi.sett
         self.image = self.sett.image("cursor")
-        self.size = self.image.get_size()
-        self.surface = pygame.Surface(self.size, pygame.SRCALPHA)
-        self.surface.blit(self.image, (0, 0))
-        self.cursor = pygame.cursors.Cursor((0, 0), self.surface)
-        pygame.mouse.set_cursor(self.cursor)
+        self.resize()
 
-    def adjust(self):
-        """Adjust the cursor's position after resizing."""
+    def resize(self):
+        """Scale the cursor to the window's size."""
 
-        self.size = self.sett.adjust(self.size)
-        self.image = self.sett.image("cursor")
+        # The cursor is drawn by the system, so it isn't scaled with the screen
+        self.size = self.sett.to_window(self.image.get_size())
         self.surface = pygame.Surface(self.size, pygame.SRCALPHA)
-        self.surface.blit(self.image, (0, 0))
+        self.surface.blit(
+            pygame.transform.smoothscale(self.image, self.size), (0, 0))
         self.cursor = pygame.cursors.Cursor((0, 0), self.surface)
-        pygame.mouse.set_cursor(self.cursor)
+        self._set_cursor()
+
+    def _set_cursor(self):
+        """Show the cursor, if the video driver supports custom cursors."""
+
+        # Without a display, e.g. under the dummy driver, the system one stays
+        try:
+            pygame.mouse.set_cursor(self.cursor)
+        except pygame.error:
+            pass
+
+class Window:
+    """Representation of the game's native window, to move it around."""
+
+    def __init__(self):
+        """Initialize the window, keeping one handle to it open."""
+
+        """With SDL2, pygame's window object moves the window directly. It
+        stays the same window after set_mode, so it's taken only once. Moves
+        wait for flush, so however many come in a frame, only the last one
+        is made. Without SDL2, the platform's functions are used."""
+
+        self.pending = None
+        try:
+            from pygame._sdl2.video import Window as SDLWindow
+            self.handle = SDLWindow.from_display_module()
+        except (ImportError, AttributeError, pygame.error):
+            self.handle = None
+
+    def get_pos(self):
+        """Return the window position."""
+
+        if self.handle is not None:
+            return self.handle.position
+        return get_window_pos()
+
+    def move(self, x, y):
+        """Move the window to the position, on the next flush."""
+
+        self.pending = (x, y)
+
+    def flush(self):
+        """Make the last move asked for since the previous flush."""
+
+        if self.pending is None:
+            return
+        if self.handle is not None:
+            self.handle.position = self.pending
+        else:
+            set_window_pos(*self.pending)
+        self.pending = None
 
 def get_window_pos():
     """Return the window position."""
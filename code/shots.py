@@ -0,0 +1,216 @@
+import math
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+def sweep(center, direction, distance, reach, walls, obstacles):
+    """Return where a moving bubble ends up, its direction and what it hit."""
+
+    """The bubble's center travels the distance in a straight line from the
+    center, along the normalized direction, bouncing off the left, right and
+    top walls, given as the bounds of its center. It stops at the first
+    point where its center is within reach of the center of an obstacle,
+    given as pairs of grid ID and center. The hit ID is None on a miss."""
+
+    left, top, right = walls
+    x, y = center
+    dx, dy = direction
+    remaining = distance
+
+    # Every leg ends at a wall, at a hit, or after the remaining distance
+    for _ in range(8):
+        leg, side, ceiling = remaining, False, False
+        if dx < 0 and (left - x) / dx <= leg:
+            leg, side = max((left - x) / dx, 0.0), True
+        elif dx > 0 and (right - x) / dx <= leg:
+            leg, side = max((right - x) / dx, 0.0), True
+        if dy < 0 and (top - y) / dy <= leg:
+            top_leg = max((top - y) / dy, 0.0)
+            side = side and top_leg >= leg
+            leg, ceiling = top_leg, True
+
+        # Find the first obstacle touched along the leg
+        hit, hit_at = None, leg
+        for id_grid, obstacle in obstacles:
+            at = contact((x, y), (dx, dy), obstacle, reach)
+            if at is not None and at <= hit_at:
+                hit, hit_at = id_grid, at
+        if hit is not None:
+            return (x + dx * hit_at, y + dy * hit_at), (dx, dy), hit
+
+        # Travel the leg, and bounce off the wall at its end
+        x, y = x + dx * leg, y + dy * leg
+        remaining -= leg
+        if side: dx = -dx
+        if ceiling: dy = -dy
+        if not side and not ceiling:
+            break
+
+    return (x, y), (dx, dy), None
+
+def contact(center, direction, obstacle, reach):
+    """Return the distance a bubble travels until it touches an obstacle."""
+
+    """The bubble touches the obstacle when the distance between their
+    centers gets down to reach. Returns None if it never does, and 0 if they
+    already touch."""
+
+    mx = center[0] - obstacle[0]
+    my = center[1] - obstacle[1]
+    c = mx * mx + my * my - reach * reach
+    if c <= 0:
+        return 0.0
+
+    # Solve |m + direction * t| = reach for the smaller t, moving closer
+    b = mx * direction[0] + my * direction[1]
+    if b >= 0:
+        return None
+    discriminant = b * b - c
+    if discriminant < 0:
+        return None
+    return -b - math.sqrt(discriminant)
+
+def trace(center, angles, reach, walls, bottom, obstacles, bounces=8):
+    """Return the paths of shots at the angles, and the grid IDs they hit."""
+
+    """Angles are in radians, counterclockwise from the right as seen on the
+    screen, so pi / 2 shoots straight up. Every shot starts at the center and
+    bounces off the walls, as in sweep, until it touches an obstacle, passes
+    the bottom bound of its center, or runs out of bounces. A path is the
+    list of points where the shot started, bounced and ended. With NumPy,
+    all shots are traced at once, a leg of every shot at a time."""
+
+    if np is not None:
+        return _trace_arrays(center, angles, reach, walls, bottom, obstacles,
+                             bounces)
+    return _trace_shots(center, angles, reach, walls, bottom, obstacles,
+                        bounces)
+
+def _trace_arrays(center, angles, reach, walls, bottom, obstacles, bounces):
+    """Return the paths and hits of shots, traced as NumPy arrays."""
+
+    left, top, right = walls
+    angles = np.asarray(angles, dtype=float)
+    count = len(angles)
+    x, y = np.full(count, float(center[0])), np.full(count, float(center[1]))
+    dx, dy = np.cos(angles), -np.sin(angles)
+    ids = np.array([id_grid for id_grid, _ in obstacles], dtype=np.intp)
+    centers = np.array([obstacle for _, obstacle in obstacles],
+                       dtype=float).reshape(-1, 2)
+
+    paths = [[(center[0], center[1])] for _ in range(count)]
+    hits = [None] * count
+    active = np.arange(count)
+    for _ in range(bounces + 1):
+        if not len(active):
+            break
+        xa, ya, dxa, dya = x[active], y[active], dx[active], dy[active]
+
+        # Find how far every shot travels to each wall, and to the bottom
+        with np.errstate(divide="ignore", invalid="ignore"):
+            side = np.where(dxa < 0, (left - xa) / dxa,
+                            np.where(dxa > 0, (right - xa) / dxa, np.inf))
+            ceiling = np.where(dya < 0, (top - ya) / dya, np.inf)
+            floor = np.where(dya > 0, (bottom - ya) / dya, np.inf)
+        side, ceiling = np.maximum(side, 0.0), np.maximum(ceiling, 0.0)
+        leg = np.minimum(np.minimum(side, ceiling), np.maximum(floor, 0.0))
+
+        # Find the first obstacle every shot touches, as contact does
+        hit_at = np.full(len(active), np.inf)
+        first = np.zeros(len(active), dtype=np.intp)
+        if len(ids):
+            mx = xa[:, None] - centers[None, :, 0]
+            my = ya[:, None] - centers[None, :, 1]
+            c = mx * mx + my * my - reach * reach
+            b = mx * dxa[:, None] + my * dya[:, None]
+            discriminant = b * b - c
+            at = np.where(
+                c <= 0, 0.0, np.where((b < 0) & (discriminant >= 0),
+                                      -b - np.sqrt(np.abs(discriminant)),
+                                      np.inf))
+            first = at.argmin(axis=1)
+            hit_at = at[np.arange(len(active)), first]
+        hit = hit_at <= leg
+
+        # Travel the legs, and bounce the shots that ended at a wall
+        travel = np.where(hit, hit_at, leg)
+        x[active], y[active] = xa + dxa * travel, ya + dya * travel
+        for index, shot in enumerate(active):
+            paths[shot].append((float(x[shot]), float(y[shot])))
+            if hit[index]:
+                hits[shot] = int(ids[first[index]])
+        bounced = ~hit & np.isfinite(leg) & ((side <= leg) | (ceiling <= leg))
+        dx[active] = np.where(bounced & (side <= leg), -dxa, dxa)
+        dy[active] = np.where(bounced & (ceiling <= leg), -dya, dya)
+        active = active[bounced]
+
+    return paths, hits
+
+def _trace_shots(center, angles, reach, walls, bottom, obstacles, bounces):
+    """Return the paths and hits of shots, traced one after another."""
+
+    left, top, right = walls
+    paths, hits = [], []
+    for angle in angles:
+        x, y = center
+        dx, dy = math.cos(angle), -math.sin(angle)
+        path, hit = [(x, y)], None
+        for _ in range(bounces + 1):
+            side = ceiling = floor = math.inf
+            if dx < 0: side = max((left - x) / dx, 0.0)
+            elif dx > 0: side = max((right - x) / dx, 0.0)
+            if dy < 0: ceiling = max((top - y) / dy, 0.0)
+            elif dy > 0: floor = max((bottom - y) / dy, 0.0)
+            leg = min(side, ceiling, floor)
+
+            hit_at = math.inf
+            for id_grid, obstacle in obstacles:
+                at = contact((x, y), (dx, dy), obstacle, reach)
+                if at is not None and at < hit_at:
+                    hit, hit_at = id_grid, at
+            if hit_at > leg:
+                hit = None
+            travel = hit_at if hit is not None else leg
+
+            x, y = x + dx * travel, y + dy * travel
+            path.append((x, y))
+            if hit is not None or math.isinf(leg) or (
+                    side > leg and ceiling > leg):
+                break
+            if side <= leg: dx = -dx
+            if ceiling <= leg: dy = -dy
+        paths.append(path)
+        hits.append(hit)
+    return paths, hits
+
+def predict(rules, centers, center, angles, color, reach, walls, bottom):
+    """Return the path, snap cell and cluster size of shots at the angles."""
+
+    """Centers holds the center of every cell of the rules' grid, by cell
+    ID. A shot snaps to the empty cell around the bubble it hit that is the
+    closest to where it stopped, or else to the closest empty cell within
+    reach. The cluster size counts the shot's bubble, and is 0 for shots
+    that leave the game area."""
+
+    board = rules.board
+    obstacles = [(id_, centers[id_]) for id_ in range(board.size)
+                 if board.is_occupied(id_)]
+    paths, hits = trace(center, angles, reach, walls, bottom, obstacles)
+
+    outcomes = []
+    for path, hit in zip(paths, hits):
+        cell = None
+        if hit is not None:
+            end = path[-1]
+            empty = [id_ for id_ in board.around(hit)
+                     if not board.is_occupied(id_)]
+            if not empty:
+                empty = [id_ for id_ in range(board.size)
+                         if not board.is_occupied(id_) and
+                         math.dist(end, centers[id_]) <= reach]
+            if empty:
+                cell = min(empty, key=lambda id_: math.dist(end, centers[id_]))
+        size = rules.joined(cell, color) if cell is not None else 0
+        outcomes.append((path, cell, size))
+    return outcomes
@@ -0,0 +1,43 @@
+import random, unittest
+import boards
+from boards import HexGrid, Board
+
+class TestMultiply(unittest.TestCase):
+    """Tests of multiplying the bubbles of a board."""
+
+    def setUp(self):
+        """Fill a board with bubbles of three colors, from a fixed seed."""
+
+        self.board = Board(HexGrid(22, 24), ["red", "yellow", "green"])
+        rng = random.Random(7)
+        for id_ in rng.sample(range(self.board.size), 150):
+            self.board.put(id_, rng.choice(self.board.colors))
+
+    def multiply(self, numpy):
+        """Return the bubbles born from the board, with or without NumPy."""
+
+        saved = boards.np
+        if not numpy:
+            boards.np = None
+        try:
+            return [self.board.multiply(drop, chance, [1, 2, 3],
+                                        random.Random(f"{drop}:{chance}"))
+                    for drop in range(5) for chance in (0.1, 0.8)]
+        finally:
+            boards.np = saved
+
+    @unittest.skipIf(boards.np is None, "NumPy isn't installed")
+    def test_same_with_and_without_numpy(self):
+        """Both ways of multiplying give the same bubbles from a seed."""
+
+        self.assertEqual(self.multiply(True), self.multiply(False))
+
+    def test_cells_taken_once(self):
+        """No cell is born twice, or where a bubble already is."""
+
+        for ids, codes in self.multiply(False):
+            self.assertEqual(len(ids), len(set(ids)))
+            self.assertFalse(any(self.board.cells[id_] for id_ in ids))
+
+if __name__ == '__main__':
+    unittest.main()
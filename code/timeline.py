@@ -0,0 +1,33 @@
+import pygame as pg
+
+class Timeline:
+    """Representation of a timeline of steps, run one after another."""
+
+    def __init__(self):
+        """Initialize an empty timeline."""
+
+        self.steps = []
+
+    def queue(self, delay, step, *args):
+        """Queue a step to run the delay in ms after the previous step."""
+
+        start = self.steps[-1][0] if self.steps else pg.time.get_ticks()
+        self.steps.append((start + delay, step, args))
+
+    def tick(self):
+        """Run every step that is due, in the order they were queued."""
+
+        now = pg.time.get_ticks()
+        while self.steps and self.steps[0][0] <= now:
+            due, step, args = self.steps.pop(0)
+            step(*args)
+
+    def busy(self):
+        """Return True if there are steps waiting to run."""
+
+        return len(self.steps) > 0
+
+    def clear(self):
+        """Drop every waiting step."""
+
+        self.steps = []
@@ -0,0 +1,52 @@
+import pygame as pg
+
+class Widgets:
+    """Representation of an index of the widgets the mouse can point at."""
+
+    def __init__(self, size):
+        """Initialize an empty index, with buckets of the specified size."""
+
+        """The screen is split into square buckets, and every widget is put
+        in each bucket its rect touches. A point is only tested against the
+        few widgets of its bucket, so finding the widget under the mouse
+        costs the same however many widgets there are."""
+
+        self.size = size
+        self.entries = []
+        self.buckets = {}
+
+    def register(self, area, widget, handler, when=None):
+        """Register a widget of an area, with the handler of its events."""
+
+        """The widget needs a rect, or a position and an image, and an
+        active method telling if a point is on it. It's only pointed at while
+        its area is visible, and when is None or returns True. Widgets
+        registered first win where widgets overlap."""
+
+        entry = (area, widget, handler, when)
+        self.entries.append(entry)
+        self._insert(entry)
+
+    def at(self, pos):
+        """Return the widget under the position and its handler, or None."""
+
+        bucket = self.buckets.get((pos[0] // self.size, pos[1] // self.size))
+        for area, widget, handler, when in bucket or ():
+            if area.visible and (when is None or when()) and (
+                    widget.active(pos)):
+                return widget, handler
+
+    def _insert(self, entry):
+        """Put an entry in every bucket its widget's rect touches."""
+
+        widget = entry[1]
+        rect = getattr(widget, "rect", None)
+        if rect is None:
+            rect = (widget.pos, widget.image.get_size())
+        rect = pg.Rect(rect)
+
+        # Entries go in registration order, so the first registered wins
+        size = self.size
+        for row in range(rect.top // size, rect.bottom // size + 1):
+            for column in range(rect.left // size, rect.right // size + 1):
+                self.buckets.setdefault((column, row), []).append(entry)